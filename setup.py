@@ -1,3 +1,5 @@
+import os
+
 from setuptools import setup, find_packages
 
 
@@ -18,7 +20,22 @@ deps = [
     "ollama"
 ]
 
-extras = {}
+extras = {
+    # Optional faster codecs, picked up automatically when installed
+    "speedups": ["orjson", "pybase64"],
+}
+
+# Optionally compile the streaming hot paths to C extensions, the pure Python sources stay the default
+ext_modules = []
+if os.environ.get("SWITCHAI_CYTHONIZE") == "1":
+    from Cython.Build import cythonize
+
+    ext_modules = cythonize(
+        ["src/switchai/providers/_mistral.py"],
+        compiler_directives={"language_level": 3, "boundscheck": False, "wraparound": False},
+        # Keep the generated C sources out of the package tree
+        build_dir="build/cython",
+    )
 
 setup(
     name="switchai",
@@ -34,6 +51,7 @@ setup(
     packages=find_packages("src"),
     install_requires=deps,
     extras_require=extras,
+    ext_modules=ext_modules,
     python_requires=">=3.6",
     classifiers=[
         "Intended Audience :: Developers",
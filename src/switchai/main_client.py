@@ -1,14 +1,47 @@
+import asyncio
+import collections
+import functools
 import glob
 import importlib
 import os
-from typing import List, Optional, Union, Generator, Type
+from typing import List, Optional, Union, Generator, Type, AsyncGenerator
 
 from PIL.Image import Image
 from pydantic import BaseModel
 
 from .base_client import BaseClient
-from .types import ChatResponse, TranscriptionResponse, ImageGenerationResponse, EmbeddingResponse
-from .utils import Task, contains_image
+from .types import ChatResponse, TranscriptionResponse, ImageGenerationResponse, EmbeddingResponse, EmbeddingUsage
+from .utils import Task, contains_image, close_cached_clients
+
+
+@functools.lru_cache(maxsize=None)
+def _get_provider_names() -> tuple[str, ...]:
+    # Get all provider files matching the pattern _*.py
+    provider_files = glob.glob(os.path.join(os.path.dirname(__file__), "providers", "_*.py"))
+    provider_modules = [os.path.basename(f)[1:-3] for f in provider_files]
+    provider_modules.remove("_init__")
+
+    return tuple(provider_modules)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_provider_adapter(provider: str):
+    # Import the provider module and construct the client class name
+    provider_module = importlib.import_module(f"switchai.providers._{provider}")
+    client_class = getattr(provider_module, f"{provider.capitalize()}ClientAdapter")
+
+    return provider_module, client_class
+
+
+@functools.lru_cache(maxsize=None)
+def _get_model_providers() -> dict[str, list[str]]:
+    # Reverse index of every supported model to the providers serving it
+    model_providers = collections.defaultdict(list)
+    for provider in _get_provider_names():
+        for model_name in _get_provider_adapter(provider)[0].SUPPORTED_MODELS:
+            model_providers[model_name].append(provider)
+
+    return dict(model_providers)
 
 
 class SwitchAI(BaseClient):
@@ -27,11 +60,8 @@ class SwitchAI(BaseClient):
 
         self.client, self.supported_tasks = self._get_provider_client(api_key)
 
-    def _get_provider_client(self, api_key: Optional[str]) -> tuple[BaseClient, str]:
-        # Get all provider files matching the pattern _*.py
-        provider_files = glob.glob(os.path.join(os.path.dirname(__file__), "providers", "_*.py"))
-        provider_modules = [os.path.basename(f)[1:-3] for f in provider_files]
-        provider_modules.remove("_init__")
+    def _get_provider_client(self, api_key: Optional[str]) -> tuple[BaseClient, frozenset]:
+        provider_modules = _get_provider_names()
 
         # Check if the specified provider is supported
         if self.provider not in provider_modules:
@@ -40,24 +70,14 @@ class SwitchAI(BaseClient):
                 f"Provider '{self.provider}' is not supported. Supported providers are: {supported_providers}."
             )
 
-        # Import the provider module
-        provider_module = importlib.import_module(f"switchai.providers._{self.provider}")
-
-        model_supported = False
-        supported_tasks = None
+        provider_module, client_class = _get_provider_adapter(self.provider)
 
         # Check if the model is supported by the specified provider and get the supported tasks
-        if self.model_name in provider_module.SUPPORTED_MODELS:
-            model_supported = True
-            supported_tasks = provider_module.SUPPORTED_MODELS[self.model_name]
+        supported_tasks = provider_module.SUPPORTED_MODELS.get(self.model_name)
 
-        if not model_supported:
+        if supported_tasks is None:
             # Find alternative providers that support the model
-            alternative_providers = [
-                provider
-                for provider in provider_modules
-                if self.model_name in importlib.import_module(f"switchai.providers._{provider}").SUPPORTED_MODELS
-            ]
+            alternative_providers = _get_model_providers().get(self.model_name, [])
 
             if alternative_providers:
                 alternatives = ", ".join(alternative_providers)
@@ -78,13 +98,20 @@ class SwitchAI(BaseClient):
                     f"The api_key client option must be set either by passing api_key to the client or by setting the {api_key_name} environment variable."
                 )
 
-        # Construct the client class name and get the class from the provider module
-        class_name = f"{self.provider.capitalize()}ClientAdapter"
-        client_class = getattr(provider_module, class_name)
-
         # Return an instance of the client class and the model category
         return client_class(self.model_name, api_key), supported_tasks
 
+    @classmethod
+    def close_all(cls) -> None:
+        """
+        Closes the provider clients shared by all SwitchAI instances.
+
+        SwitchAI instances created with the same provider and API key share the same underlying HTTP client and
+        its pool of connections. Instances created after this call get new clients. Some provider SDKs (Replicate,
+        Voyage AI and Deepgram) can't be closed explicitly, their clients are only released.
+        """
+        close_cached_clients()
+
     def chat(
         self,
         messages: List[str | dict | ChatResponse],
@@ -94,36 +121,197 @@ class SwitchAI(BaseClient):
         response_format: Optional[Type[BaseModel]] = None,
         stream: Optional[bool] = False,
     ) -> Union[ChatResponse, Generator[ChatResponse, None, None]]:
-        if Task.TEXT_GENERATION not in self.supported_tasks and Task.IMAGE_TEXT_TO_TEXT not in self.supported_tasks:
-            raise ValueError(f"Model '{self.model_name}' is not a chat model.")
+        self._check_chat_inputs(messages)
+        return self.client.chat(messages, temperature, max_tokens, tools, response_format, stream)
 
-        if contains_image(messages):
-            if Task.IMAGE_TEXT_TO_TEXT not in self.supported_tasks:
-                raise ValueError(
-                    f"Your request contains an image, but model '{self.model_name}' does not support have that 'vision' capability."
-                )
+    async def achat(
+        self,
+        messages: List[str | dict | ChatResponse],
+        temperature: Optional[float] = 1.0,
+        max_tokens: Optional[int] = None,
+        tools: Optional[List] = None,
+        response_format: Optional[Type[BaseModel]] = None,
+        stream: Optional[bool] = False,
+    ) -> Union[ChatResponse, AsyncGenerator[ChatResponse, None]]:
+        self._check_chat_inputs(messages)
+        return await self.client.achat(messages, temperature, max_tokens, tools, response_format, stream)
 
-        return self.client.chat(messages, temperature, max_tokens, tools, response_format, stream)
+    async def abatch_chat(
+        self,
+        messages_list: List[List[str | dict | ChatResponse]],
+        temperature: Optional[float] = 1.0,
+        max_tokens: Optional[int] = None,
+        tools: Optional[List] = None,
+        response_format: Optional[Type[BaseModel]] = None,
+        concurrency: int = 20,
+    ) -> List[ChatResponse]:
+        """
+        Sends several chat requests concurrently and returns their responses in the same order.
 
-    def embed(self, inputs: Union[str, Image, List[Union[str, Image]]]) -> EmbeddingResponse:
-        if (
-            Task.TEXT_TO_EMBEDDING not in self.supported_tasks
-            and Task.IMAGE_TEXT_TO_EMBEDDING not in self.supported_tasks
-        ):
-            raise ValueError(f"Model '{self.model_name}' is not an embedding model.")
+        Args:
+            messages_list: A list of conversations, each one being a list of messages to send to the model.
+            temperature: Sampling temperature to use, between 0 and 2.
+            max_tokens: The maximum number of tokens to generate. Defaults to None.
+            tools: A list of tools the model may call.
+            response_format: An object specifying the format that the model must output.
+            concurrency: The maximum number of requests in flight at the same time.
+
+        Returns:
+            List[ChatResponse]: The responses from the model.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
 
-        if contains_image(inputs):
-            if Task.IMAGE_TEXT_TO_EMBEDDING not in self.supported_tasks:
-                raise ValueError(f"Model {self.model_name} does not support image embeddings.")
+        async def _chat(messages):
+            async with semaphore:
+                return await self.achat(messages, temperature, max_tokens, tools, response_format)
 
+        return await asyncio.gather(*[_chat(messages) for messages in messages_list])
+
+    def embed(self, inputs: Union[str, Image, List[Union[str, Image]]]) -> EmbeddingResponse:
+        self._check_embed_inputs(inputs)
         return self.client.embed(inputs)
 
+    async def aembed(self, inputs: Union[str, Image, List[Union[str, Image]]]) -> EmbeddingResponse:
+        self._check_embed_inputs(inputs)
+        return await self.client.aembed(inputs)
+
+    def embed_many(
+        self, inputs: Union[str, Image, List[Union[str, Image]]], batch_size: int = 512
+    ) -> EmbeddingResponse:
+        """
+        Embeds a large list of inputs by splitting it into batches that each fit in a single request.
+
+        Args:
+            inputs: The inputs to embed.
+            batch_size: The maximum number of inputs sent in a single request.
+
+        Returns:
+            EmbeddingResponse: The embeddings of all the inputs, indexed by their position in ``inputs``.
+        """
+        inputs = self._as_input_list(inputs)
+        self._check_embed_inputs(inputs)
+
+        # Providers that read a list as a single input expose a method embedding each item separately
+        embed = getattr(self.client, "embed_each", self.client.embed)
+        responses = [embed(batch) for batch in self._split_batches(inputs, batch_size)]
+        return self._merge_embedding_responses(responses, batch_size)
+
+    async def aembed_many(
+        self, inputs: Union[str, Image, List[Union[str, Image]]], batch_size: int = 512, concurrency: int = 8
+    ) -> EmbeddingResponse:
+        """
+        Embeds a large list of inputs by splitting it into batches that are sent concurrently.
+
+        Args:
+            inputs: The inputs to embed.
+            batch_size: The maximum number of inputs sent in a single request.
+            concurrency: The maximum number of requests in flight at the same time.
+
+        Returns:
+            EmbeddingResponse: The embeddings of all the inputs, indexed by their position in ``inputs``.
+        """
+        inputs = self._as_input_list(inputs)
+        self._check_embed_inputs(inputs)
+
+        semaphore = asyncio.Semaphore(concurrency)
+        aembed = getattr(self.client, "aembed_each", self.client.aembed)
+
+        async def _embed(batch):
+            async with semaphore:
+                return await aembed(batch)
+
+        responses = await asyncio.gather(*[_embed(batch) for batch in self._split_batches(inputs, batch_size)])
+        return self._merge_embedding_responses(responses, batch_size)
+
+    def embed_batch_file(self, inputs: Union[str, List[str]], poll_interval: float = 30.0) -> EmbeddingResponse:
+        """
+        Embeds a large list of texts with the provider's asynchronous batch API, which is cheaper than regular
+        requests but can take up to 24 hours to complete. This method blocks until the batch is done.
+
+        Args:
+            inputs: The texts to embed.
+            poll_interval: The number of seconds to wait between two checks of the batch status.
+
+        Returns:
+            EmbeddingResponse: The embeddings of all the inputs, indexed by their position in ``inputs``.
+        """
+        inputs = self._as_input_list(inputs)
+        self._check_embed_inputs(inputs)
+
+        if not hasattr(self.client, "embed_batch_file"):
+            raise ValueError(f"Provider '{self.provider}' does not support batch embedding files.")
+
+        return self.client.embed_batch_file(inputs, poll_interval)
+
     def transcribe(self, audio_path: str, language: Optional[str] = None) -> TranscriptionResponse:
-        if Task.AUDIO_TO_TEXT not in self.supported_tasks:
-            raise ValueError(f"Model '{self.model_name}' is not a speech-to-text model.")
+        self._check_transcribe_inputs()
         return self.client.transcribe(audio_path, language)
 
+    async def atranscribe(self, audio_path: str, language: Optional[str] = None) -> TranscriptionResponse:
+        self._check_transcribe_inputs()
+        return await self.client.atranscribe(audio_path, language)
+
     def generate_image(self, prompt: str, n: int = 1) -> ImageGenerationResponse:
         if Task.TEXT_TO_IMAGE not in self.supported_tasks:
             raise ValueError(f"Model '{self.model_name}' is not an image generation model.")
         return self.client.generate_image(prompt, n)
+
+    def _check_chat_inputs(self, messages):
+        if Task.TEXT_GENERATION not in self.supported_tasks and Task.IMAGE_TEXT_TO_TEXT not in self.supported_tasks:
+            raise ValueError(f"Model '{self.model_name}' is not a chat model.")
+
+        # Check the task set first so vision models never have to scan the messages for images
+        if Task.IMAGE_TEXT_TO_TEXT not in self.supported_tasks and contains_image(messages):
+            raise ValueError(
+                f"Your request contains an image, but model '{self.model_name}' does not support have that 'vision' capability."
+            )
+
+    def _check_embed_inputs(self, inputs):
+        if (
+            Task.TEXT_TO_EMBEDDING not in self.supported_tasks
+            and Task.IMAGE_TEXT_TO_EMBEDDING not in self.supported_tasks
+        ):
+            raise ValueError(f"Model '{self.model_name}' is not an embedding model.")
+
+        if Task.IMAGE_TEXT_TO_EMBEDDING not in self.supported_tasks and contains_image(inputs):
+            raise ValueError(f"Model {self.model_name} does not support image embeddings.")
+
+    @staticmethod
+    def _as_input_list(inputs):
+        # A single input would otherwise be sliced into batches of characters
+        if isinstance(inputs, (str, Image)):
+            return [inputs]
+        return list(inputs)
+
+    @staticmethod
+    def _split_batches(inputs, batch_size):
+        return [inputs[i : i + batch_size] for i in range(0, len(inputs), batch_size)]
+
+    @staticmethod
+    def _merge_embedding_responses(responses, batch_size):
+        embeddings = []
+        input_tokens = None
+        total_tokens = None
+        for batch_index, response in enumerate(responses):
+            # Shift the indexes of each batch so that they refer to the position in the original inputs
+            offset = batch_index * batch_size
+            for embedding in response.embeddings:
+                embeddings.append(embedding.model_copy(update={"index": offset + embedding.index}))
+
+            if response.usage is not None:
+                if response.usage.input_tokens is not None:
+                    input_tokens = (input_tokens or 0) + response.usage.input_tokens
+                if response.usage.total_tokens is not None:
+                    total_tokens = (total_tokens or 0) + response.usage.total_tokens
+
+        return EmbeddingResponse(
+            id=None,
+            object=responses[0].object if responses else None,
+            model=responses[0].model if responses else None,
+            usage=EmbeddingUsage(input_tokens=input_tokens, total_tokens=total_tokens),
+            embeddings=embeddings,
+        )
+
+    def _check_transcribe_inputs(self):
+        if Task.AUDIO_TO_TEXT not in self.supported_tasks:
+            raise ValueError(f"Model '{self.model_name}' is not a speech-to-text model.")
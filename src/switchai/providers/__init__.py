@@ -1,13 +1,37 @@
-from ._openai import (
-    OpenaiChatInputsAdapter,
-    OpenaiChatResponseAdapter,
-    OpenaiEmbeddingResponseAdapter,
-    OpenaiTranscriptionResponseAdapter,
-    OpenaiImageGenerationResponseAdapter,
-)
-from ._anthropic import AnthropicChatInputsAdapter, AnthropicChatResponseAdapter
-from ._google import GoogleChatInputsAdapter, GoogleChatResponseAdapter, GoogleEmbeddingResponseAdapter
-from ._mistral import MistralChatInputsAdapter, MistralChatResponseAdapter, MistralEmbeddingResponseAdapter
-from ._voyageai import VoyageaiEmbeddingResponseAdapter
-from ._deepgram import DeepgramTranscriptionResponseAdapter
-from ._replicate import ReplicateImageGenerationResponseAdapter, ReplicateTranscriptionResponseAdapter
+import importlib
+
+
+# Adapters are resolved on first access, so importing one provider module does not pull in every provider SDK
+_ADAPTER_MODULES = {
+    "OpenaiChatInputsAdapter": "_openai",
+    "OpenaiChatResponseAdapter": "_openai",
+    "OpenaiEmbeddingResponseAdapter": "_openai",
+    "OpenaiTranscriptionResponseAdapter": "_openai",
+    "OpenaiImageGenerationResponseAdapter": "_openai",
+    "AnthropicChatInputsAdapter": "_anthropic",
+    "AnthropicChatResponseAdapter": "_anthropic",
+    "GoogleChatInputsAdapter": "_google",
+    "GoogleChatResponseAdapter": "_google",
+    "GoogleEmbeddingResponseAdapter": "_google",
+    "MistralChatInputsAdapter": "_mistral",
+    "MistralChatResponseAdapter": "_mistral",
+    "MistralEmbeddingResponseAdapter": "_mistral",
+    "VoyageaiEmbeddingResponseAdapter": "_voyageai",
+    "DeepgramTranscriptionResponseAdapter": "_deepgram",
+    "ReplicateImageGenerationResponseAdapter": "_replicate",
+    "ReplicateTranscriptionResponseAdapter": "_replicate",
+}
+
+__all__ = list(_ADAPTER_MODULES)
+
+
+def __getattr__(name):
+    if name in _ADAPTER_MODULES:
+        module = importlib.import_module(f".{_ADAPTER_MODULES[name]}", __name__)
+        return getattr(module, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
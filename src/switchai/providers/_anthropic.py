@@ -1,26 +1,42 @@
-import copy
 import json
-import warnings
-from typing import List, Optional, Generator, Union, Type
+from typing import List, Optional, Generator, Union, Type, AsyncGenerator
 
-from anthropic import Anthropic, NOT_GIVEN, BaseModel
+from anthropic import Anthropic, AsyncAnthropic, NOT_GIVEN
+from pydantic import BaseModel
 
 from ..base_client import BaseClient
 from ..types import ChatResponse, ChatUsage, ChatMessage, ChatToolCall, Function
-from ..utils import is_url, encode_image, inline_defs, Task
-
-
-SUPPORTED_MODELS = {
-    "claude-3-5-sonnet-latest": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
-    "claude-3-5-haiku-latest": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
-    "claude-3-opus-latest": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
-}
+from ..utils import (
+    is_url,
+    encode_image,
+    inline_defs,
+    warn_once,
+    get_cached_client,
+    get_cached_async_client,
+    freeze_supported_models,
+    Task,
+)
+
+
+SUPPORTED_MODELS = freeze_supported_models(
+    {
+        "claude-3-5-sonnet-latest": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
+        "claude-3-5-haiku-latest": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
+        "claude-3-opus-latest": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
+    }
+)
 
 
 class AnthropicClientAdapter(BaseClient):
     def __init__(self, model_name: str, api_key: str):
         self.model_name = model_name
-        self.client = Anthropic(api_key=api_key)
+        self._api_key = api_key
+        self.client = get_cached_client(Anthropic, api_key=api_key)
+
+    @property
+    def async_client(self):
+        # Created on first use and shared per event loop, so sync-only callers never pay for it
+        return get_cached_async_client(AsyncAnthropic, api_key=self._api_key)
 
     def chat(
         self,
@@ -31,6 +47,34 @@ class AnthropicClientAdapter(BaseClient):
         response_format: Optional[Type[BaseModel]] = None,
         stream: Optional[bool] = False,
     ) -> Union[ChatResponse, Generator[ChatResponse, None, None]]:
+        response = self.client.messages.create(
+            **self._build_chat_kwargs(messages, temperature, max_tokens, tools, response_format, stream)
+        )
+
+        if stream:
+            return self._stream_chat_response(response)
+        else:
+            return AnthropicChatResponseAdapter(response, parse_tools_as_choices=response_format is not None)
+
+    async def achat(
+        self,
+        messages: List[str | dict | ChatResponse],
+        temperature: Optional[float] = 1.0,
+        max_tokens: Optional[int] = None,
+        tools: Optional[List] = None,
+        response_format: Optional[Type[BaseModel]] = None,
+        stream: Optional[bool] = False,
+    ) -> Union[ChatResponse, AsyncGenerator[ChatResponse, None]]:
+        response = await self.async_client.messages.create(
+            **self._build_chat_kwargs(messages, temperature, max_tokens, tools, response_format, stream)
+        )
+
+        if stream:
+            return self._astream_chat_response(response)
+        else:
+            return AnthropicChatResponseAdapter(response, parse_tools_as_choices=response_format is not None)
+
+    def _build_chat_kwargs(self, messages, temperature, max_tokens, tools, response_format, stream):
         # If max_tokens is not specified, set it to 4096.
         # This ensures compatibility with all Anthropic models,
         # as 4096 is the minimum supported value across these models.
@@ -38,26 +82,21 @@ class AnthropicClientAdapter(BaseClient):
             max_tokens = 4096
 
         if response_format is not None and tools is not None:
-            warnings.warn(
+            warn_once(
                 "Anthropic models do not support the use of response_format and tools at the same time. Ignoring tools."
             )
 
         adapted_inputs = AnthropicChatInputsAdapter(messages, tools, response_format)
 
-        response = self.client.messages.create(
-            model=self.model_name,
-            messages=adapted_inputs.messages,
-            system=adapted_inputs.system_prompt,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            tools=adapted_inputs.response_format if response_format else adapted_inputs.tools,
-            stream=stream,
-        )
-
-        if stream:
-            return self._stream_chat_response(response)
-        else:
-            return AnthropicChatResponseAdapter(response, parse_tools_as_choices=response_format is not None)
+        return {
+            "model": self.model_name,
+            "messages": adapted_inputs.messages,
+            "system": adapted_inputs.system_prompt,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "tools": adapted_inputs.response_format if response_format else adapted_inputs.tools,
+            "stream": stream,
+        }
 
     def _stream_chat_response(self, response):
         for chunk in response:
@@ -65,6 +104,12 @@ class AnthropicClientAdapter(BaseClient):
                 continue
             yield AnthropicChatResponseChunkAdapter(chunk)
 
+    async def _astream_chat_response(self, response):
+        async for chunk in response:
+            if chunk.type in ["message_start", "content_block_stop", "content_block_start", "message_stop"]:
+                continue
+            yield AnthropicChatResponseChunkAdapter(chunk)
+
 
 class AnthropicChatInputsAdapter:
     def __init__(self, messages, tools=None, response_format=None):
@@ -88,20 +133,22 @@ class AnthropicChatInputsAdapter:
         return message
 
     def _adapt_chat_response(self, chat_response):
+        message = chat_response.message
         if chat_response.tool_calls:
+            tool_call = chat_response.tool_calls[0]
             return {
-                "role": chat_response.message.role,
+                "role": message.role,
                 "content": [
-                    {"type": "text", "text": chat_response.message.content},
+                    {"type": "text", "text": message.content},
                     {
                         "type": "tool_use",
-                        "id": chat_response.tool_calls[0].id,
-                        "name": chat_response.tool_calls[0].function.name,
-                        "input": chat_response.tool_calls[0].function.arguments,
+                        "id": tool_call.id,
+                        "name": tool_call.function.name,
+                        "input": tool_call.function.arguments,
                     },
                 ],
             }
-        return {"role": chat_response.message.role, "content": chat_response.message.content}
+        return {"role": message.role, "content": message.content}
 
     def _adapt_tool_message(self, message):
         return {
@@ -151,9 +198,10 @@ class AnthropicChatInputsAdapter:
 
         adapted_tools = []
         for tool in tools:
-            tool_copy = copy.deepcopy(tool)
-            tool_copy["function"]["input_schema"] = tool_copy["function"].pop("parameters")
-            adapted_tools.append(tool_copy["function"])
+            function = tool["function"]
+            adapted_tool = {key: value for key, value in function.items() if key != "parameters"}
+            adapted_tool["input_schema"] = function["parameters"]
+            adapted_tools.append(adapted_tool)
 
         return adapted_tools
 
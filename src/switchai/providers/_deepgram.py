@@ -1,33 +1,53 @@
+import asyncio
+from pathlib import Path
 from typing import Optional
 
 from deepgram import DeepgramClient, PrerecordedOptions, FileSource
 
 from ..base_client import BaseClient
 from ..types import TranscriptionResponse
-from ..utils import Task
+from ..utils import get_cached_client, freeze_supported_models, Task, UPLOAD_BUFFER_SIZE
 
 
-SUPPORTED_MODELS = {
-    "nova-2": [Task.AUDIO_TO_TEXT],
-    "nova": [Task.AUDIO_TO_TEXT],
-    "enhanced": [Task.AUDIO_TO_TEXT],
-    "base": [Task.AUDIO_TO_TEXT],
-    "whisper-tiny": [Task.AUDIO_TO_TEXT],
-    "whisper-small": [Task.AUDIO_TO_TEXT],
-    "whisper-base": [Task.AUDIO_TO_TEXT],
-    "whisper-medium": [Task.AUDIO_TO_TEXT],
-    "whisper-large": [Task.AUDIO_TO_TEXT],
-}
+SUPPORTED_MODELS = freeze_supported_models(
+    {
+        "nova-2": [Task.AUDIO_TO_TEXT],
+        "nova": [Task.AUDIO_TO_TEXT],
+        "enhanced": [Task.AUDIO_TO_TEXT],
+        "base": [Task.AUDIO_TO_TEXT],
+        "whisper-tiny": [Task.AUDIO_TO_TEXT],
+        "whisper-small": [Task.AUDIO_TO_TEXT],
+        "whisper-base": [Task.AUDIO_TO_TEXT],
+        "whisper-medium": [Task.AUDIO_TO_TEXT],
+        "whisper-large": [Task.AUDIO_TO_TEXT],
+    }
+)
 
 
 class DeepgramClientAdapter(BaseClient):
     def __init__(self, model_name: str, api_key: str):
         self.model_name = model_name
-        self.client = DeepgramClient(api_key=api_key)
+        self.client = get_cached_client(DeepgramClient, api_key=api_key)
 
     def transcribe(self, audio_path: str, language: Optional[str] = None) -> TranscriptionResponse:
-        with open(audio_path, "rb") as file:
-            buffer_data = file.read()
+        options = PrerecordedOptions(
+            model=self.model_name,
+            language=language,
+        )
+
+        # Stream the file instead of loading it in memory, the upload starts before the whole file is read
+        with open(audio_path, "rb", buffering=UPLOAD_BUFFER_SIZE) as file:
+            payload: FileSource = {
+                "stream": file,
+            }
+
+            response = self.client.listen.rest.v("1").transcribe_file(payload, options)
+
+        return DeepgramTranscriptionResponseAdapter(response)
+
+    async def atranscribe(self, audio_path: str, language: Optional[str] = None) -> TranscriptionResponse:
+        # The async client can't consume a blocking file stream, so the file is read off the event loop
+        buffer_data = await asyncio.to_thread(Path(audio_path).read_bytes)
 
         payload: FileSource = {
             "buffer": buffer_data,
@@ -38,7 +58,7 @@ class DeepgramClientAdapter(BaseClient):
             language=language,
         )
 
-        response = self.client.listen.rest.v("1").transcribe_file(payload, options)
+        response = await self.client.listen.asyncrest.v("1").transcribe_file(payload, options)
 
         return DeepgramTranscriptionResponseAdapter(response)
 
@@ -1,15 +1,18 @@
 from openai import OpenAI
 
 from ._openai import OpenaiClientAdapter
-from ..utils import Task
+from ..utils import get_cached_client, freeze_supported_models, Task
 
-SUPPORTED_MODELS = {
-    "deepseek-chat": [Task.TEXT_GENERATION],
-    "deepseek-reasoner": [Task.TEXT_GENERATION],
-}
+SUPPORTED_MODELS = freeze_supported_models(
+    {
+        "deepseek-chat": [Task.TEXT_GENERATION],
+        "deepseek-reasoner": [Task.TEXT_GENERATION],
+    }
+)
 
 
 class DeepseekClientAdapter(OpenaiClientAdapter):
     def __init__(self, model_name: str, api_key: str):
         self.model_name = model_name
-        self.client = OpenAI(api_key=api_key, base_url="https://api.deepseek.com")
+        self._client_kwargs = {"api_key": api_key, "base_url": "https://api.deepseek.com"}
+        self.client = get_cached_client(OpenAI, **self._client_kwargs)
@@ -1,7 +1,8 @@
-from typing import Union, List, Optional, Generator, Type
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Union, List, Optional, Generator, Type, AsyncGenerator
 
-import google.generativeai as genai
-import httpx
 from PIL.Image import Image
 from pydantic import BaseModel
 
@@ -16,25 +17,60 @@ from ..types import (
     EmbeddingUsage,
     Embedding,
 )
-from ..utils import is_url, encode_image, inline_defs, Task
+from ..utils import (
+    is_url,
+    encode_image,
+    b64encode_as_string,
+    inline_defs,
+    download_files,
+    adownload_files,
+    get_image_mime_type,
+    freeze_supported_models,
+    Task,
+)
+
+SUPPORTED_MODELS = freeze_supported_models(
+    {
+        "gemini-1.5-flash": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
+        "gemini-1.5-pro": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
+        "gemini-1.5-flash-8b": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
+        "models/text-embedding-004": [Task.TEXT_TO_EMBEDDING],
+        "models/embedding-001": [Task.TEXT_TO_EMBEDDING],
+    }
+)
 
-SUPPORTED_MODELS = {
-    "gemini-1.5-flash": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
-    "gemini-1.5-pro": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
-    "gemini-1.5-flash-8b": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
-    "models/text-embedding-004": [Task.TEXT_TO_EMBEDDING],
-    "models/embedding-001": [Task.TEXT_TO_EMBEDDING],
-}
+# Maximum number of models, one per system prompt, kept by each client
+_MAX_CACHED_MODELS = 32
+
+# Adapted response schemas, keyed by response format class
+_SCHEMA_CACHE = weakref.WeakKeyDictionary()
+
+
+def _remove_title_keys(schema):
+    # The schema is freshly generated and only used once, so it is modified in place
+    stack = [schema]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            node.pop("title", None)
+            stack.extend(value for value in node.values() if isinstance(value, (dict, list)))
+        else:
+            stack.extend(item for item in node if isinstance(item, (dict, list)))
 
 
 class GoogleClientAdapter(BaseClient):
     def __init__(self, model_name: str, api_key: str):
         self.model_name = model_name
-        # Delay the client creation until the chat method is called
-        # because a system prompt can't be set after the client is created
-        self.client = None
+        # Models are created when the chat method is called and cached by system prompt,
+        # because a system prompt can't be set after the model is created
+        self._models = OrderedDict()
+        self._models_lock = threading.Lock()
 
-        genai.configure(api_key=api_key)
+        # Importing the Gemini SDK is slow (it loads gRPC), so it is deferred until a Google client is created
+        import google.generativeai as genai
+
+        self.genai = genai
+        self.genai.configure(api_key=api_key)
 
     def chat(
         self,
@@ -45,12 +81,45 @@ class GoogleClientAdapter(BaseClient):
         response_format: Optional[Type[BaseModel]] = None,
         stream: Optional[bool] = False,
     ) -> Union[ChatResponse, Generator[ChatResponse, None, None]]:
-        adapted_inputs = GoogleChatInputsAdapter(messages, tools, response_format)
+        model, chat_kwargs = self._build_chat_kwargs(messages, temperature, max_tokens, tools, response_format, stream)
+        response = model.generate_content(**chat_kwargs)
+
+        if stream:
+            return self._stream_chat_response(response)
+        else:
+            return GoogleChatResponseAdapter(response)
+
+    async def achat(
+        self,
+        messages: List[str | dict | ChatResponse],
+        temperature: Optional[float] = 1.0,
+        max_tokens: Optional[int] = None,
+        tools: Optional[List] = None,
+        response_format: Optional[Type[BaseModel]] = None,
+        stream: Optional[bool] = False,
+    ) -> Union[ChatResponse, AsyncGenerator[ChatResponse, None]]:
+        # Fetch the image URLs asynchronously, so the event loop is not blocked by the downloads
+        urls = GoogleChatInputsAdapter.get_image_urls(messages)
+        downloaded_images = dict(zip(urls, await adownload_files(urls)))
 
-        if self.client is None:
-            self.client = genai.GenerativeModel(self.model_name, system_instruction=adapted_inputs.system_prompt)
+        model, chat_kwargs = self._build_chat_kwargs(
+            messages, temperature, max_tokens, tools, response_format, stream, downloaded_images
+        )
+        response = await model.generate_content_async(**chat_kwargs)
+
+        if stream:
+            return self._astream_chat_response(response)
+        else:
+            return GoogleChatResponseAdapter(response)
 
-        generation_config = genai.types.GenerationConfig(
+    def _build_chat_kwargs(
+        self, messages, temperature, max_tokens, tools, response_format, stream, downloaded_images=None
+    ):
+        adapted_inputs = GoogleChatInputsAdapter(messages, tools, response_format, downloaded_images)
+
+        model = self._get_model(adapted_inputs.system_prompt)
+
+        generation_config = self.genai.types.GenerationConfig(
             max_output_tokens=max_tokens,
             temperature=temperature,
         )
@@ -58,27 +127,52 @@ class GoogleClientAdapter(BaseClient):
             generation_config.response_schema = adapted_inputs.response_format
             generation_config.response_mime_type = "application/json"
 
-        response = self.client.generate_content(
-            contents=adapted_inputs.messages,
-            generation_config=generation_config,
-            tools=adapted_inputs.tools,
-            stream=stream,
-        )
+        return model, {
+            "contents": adapted_inputs.messages,
+            "generation_config": generation_config,
+            "tools": adapted_inputs.tools,
+            "stream": stream,
+        }
 
-        if stream:
-            return self._stream_chat_response(response)
-        else:
-            return GoogleChatResponseAdapter(response)
+    def _get_model(self, system_prompt):
+        # The lookup, insertion and eviction must happen together, the client can be shared by several threads
+        with self._models_lock:
+            model = self._models.get(system_prompt)
+            if model is None:
+                model = self.genai.GenerativeModel(self.model_name, system_instruction=system_prompt)
+                self._models[system_prompt] = model
+                # System prompts can be unique per request, so only the most recently used models are kept
+                if len(self._models) > _MAX_CACHED_MODELS:
+                    self._models.popitem(last=False)
+            else:
+                self._models.move_to_end(system_prompt)
+
+        return model
 
     def _stream_chat_response(self, response):
         for chunk in response:
             yield GoogleChatResponseChunkAdapter(chunk)
 
+    async def _astream_chat_response(self, response):
+        async for chunk in response:
+            yield GoogleChatResponseChunkAdapter(chunk)
+
     def embed(self, inputs: Union[str, Image, List[Union[str, Image]]]) -> EmbeddingResponse:
         if isinstance(inputs, str):
             inputs = [inputs]
 
-        response = genai.embed_content(
+        response = self.genai.embed_content(
+            content=inputs,
+            model=self.model_name,
+        )
+
+        return GoogleEmbeddingResponseAdapter(response)
+
+    async def aembed(self, inputs: Union[str, Image, List[Union[str, Image]]]) -> EmbeddingResponse:
+        if isinstance(inputs, str):
+            inputs = [inputs]
+
+        response = await self.genai.embed_content_async(
             content=inputs,
             model=self.model_name,
         )
@@ -87,16 +181,39 @@ class GoogleClientAdapter(BaseClient):
 
 
 class GoogleChatInputsAdapter:
-    def __init__(self, messages, tools=None, response_format=None):
+    def __init__(self, messages, tools=None, response_format=None, downloaded_images=None):
         self.system_prompt = None
         if messages[0]["role"] == "system":
             self.system_prompt = messages[0]["content"]
             messages = messages[1:]
 
+        # Images can be downloaded beforehand by the caller, as the async path does
+        if downloaded_images is None:
+            urls = self.get_image_urls(messages)
+            downloaded_images = dict(zip(urls, download_files(urls)))
+
+        self.downloaded_images = downloaded_images
         self.messages = [self._adapt_message(m) for m in messages]
         self.tools = self._adapt_tools(tools)
         self.response_format = self._adapt_response_format(response_format)
 
+    @staticmethod
+    def get_image_urls(messages):
+        # All the image URLs of the request are collected, so they can be fetched concurrently
+        urls = []
+        for message in messages:
+            if isinstance(message, ChatResponse) or message["role"] != "user":
+                continue
+            if not isinstance(message.get("content"), list):
+                continue
+
+            for content_item in message["content"]:
+                image = content_item.get("image")
+                if content_item.get("type") == "image" and isinstance(image, str) and is_url(image):
+                    urls.append(image)
+
+        return list(dict.fromkeys(urls))
+
     def _adapt_message(self, message):
         if isinstance(message, ChatResponse):
             return self._adapt_chat_response(message)
@@ -108,19 +225,21 @@ class GoogleChatInputsAdapter:
         return {"role": message["role"], "parts": message["content"]}
 
     def _adapt_chat_response(self, chat_response):
+        message = chat_response.message
         if chat_response.tool_calls:
+            function = chat_response.tool_calls[0].function
             return {
-                "role": chat_response.message.role,
+                "role": message.role,
                 "parts": [
                     {
                         "function_call": {
-                            "name": chat_response.tool_calls[0].function.name,
-                            "args": chat_response.tool_calls[0].function.arguments,
+                            "name": function.name,
+                            "args": function.arguments,
                         }
                     }
                 ],
             }
-        return {"role": chat_response.message.role, "parts": chat_response.message.content}
+        return {"role": message.role, "parts": message.content}
 
     def _adapt_tool_message(self, message):
         return {
@@ -142,11 +261,11 @@ class GoogleChatInputsAdapter:
         original_content = message.get("content", [])
         adapted_content = []
 
-        if isinstance(original_content, list):
+        if isinstance(original_content, str):
+            adapted_content.append({"text": original_content})
+        elif isinstance(original_content, list):
             for content_item in original_content:
                 adapted_content.append(self._adapt_content_item(content_item))
-        elif isinstance(original_content, str):
-            adapted_content.append({"text": original_content})
 
         return {"role": message["role"], "parts": adapted_content}
 
@@ -161,9 +280,16 @@ class GoogleChatInputsAdapter:
     def _adapt_image_content(self, content_item):
         image = content_item.get("image")
         if isinstance(image, str) and is_url(image):
-            image = httpx.get(image).content
+            image = self.downloaded_images[image]
+
+        # Images that are already in a format supported by Gemini are sent as is, without re-encoding
+        if isinstance(image, bytes):
+            mime_type = get_image_mime_type(image)
+            if mime_type is not None:
+                return {"mime_type": mime_type, "data": b64encode_as_string(image)}
+
         base64_image = encode_image(image)
-        return {"mime_type": "image/jpeg", "data": base64_image}
+        return {"mime_type": "image/png", "data": base64_image}
 
     def _adapt_tools(self, tools):
         adapted_tools = None
@@ -173,7 +299,7 @@ class GoogleChatInputsAdapter:
             for tool in tools:
                 function = tool["function"]
                 if "description" not in function:
-                    function["description"] = ""
+                    function = {**function, "description": ""}
                 adapted_tools[0]["function_declarations"].append(function)
 
         return adapted_tools
@@ -182,45 +308,55 @@ class GoogleChatInputsAdapter:
         if response_format is None:
             return None
 
-        def remove_title_keys(d):
-            if isinstance(d, dict):
-                return {k: remove_title_keys(v) for k, v in d.items() if k != "title"}
-            elif isinstance(d, list):
-                return [remove_title_keys(item) for item in d]
-            else:
-                return d
+        schema = _SCHEMA_CACHE.get(response_format)
+        if schema is not None:
+            return schema
 
-        response_format = response_format.model_json_schema()
-        response_format = remove_title_keys(response_format)
-        response_format = inline_defs(response_format)
+        schema = response_format.model_json_schema()
+        _remove_title_keys(schema)
+        schema = inline_defs(schema)
+        _SCHEMA_CACHE[response_format] = schema
 
-        return response_format
+        return schema
 
 
-class GoogleChatResponseAdapter(ChatResponse):
-    def __init__(self, response):
-        choice = response.candidates[0]
-        tool_calls = [
-            ChatToolCall(
-                id=None,
-                function=Function(name=part.function_call.name, arguments=dict(part.function_call.args)),
-            )
-            for part in choice.content.parts
-            if "function_call" in part
-        ]
-        tool_calls = tool_calls if len(tool_calls) > 0 else None
+def _adapt_chat_response_fields(response, is_chunk=False):
+    choice = response.candidates[0]
+    # Accessing parts materializes a new list from the underlying protobuf field, so it is only done once
+    parts = list(choice.content.parts)
 
-        super().__init__(
+    tool_calls = [
+        ChatToolCall(
             id=None,
-            message=ChatMessage(role="assistant", content=choice.content.parts[0].text),
-            tool_calls=tool_calls,
-            usage=ChatUsage(
-                input_tokens=response.usage_metadata.prompt_token_count,
-                output_tokens=response.usage_metadata.candidates_token_count,
-                total_tokens=response.usage_metadata.total_token_count,
-            ),
-            finish_reason=self.adapt_finish_reason(choice.finish_reason.name.lower(), tool_calls),
+            function=Function(name=part.function_call.name, arguments=dict(part.function_call.args)),
         )
+        for part in parts
+        if "function_call" in part
+    ]
+    tool_calls = tool_calls if len(tool_calls) > 0 else None
+    message = ChatMessage(role="assistant", content=parts[0].text if parts else None)
+
+    # Intermediate stream chunks (finish reason still unspecified) only carry the generated delta.
+    # Usage and finish reason are set on the last chunk.
+    if is_chunk and not choice.finish_reason:
+        return {"id": None, "message": message, "tool_calls": tool_calls, "usage": None, "finish_reason": None}
+
+    return {
+        "id": None,
+        "message": message,
+        "tool_calls": tool_calls,
+        "usage": ChatUsage(
+            input_tokens=response.usage_metadata.prompt_token_count,
+            output_tokens=response.usage_metadata.candidates_token_count,
+            total_tokens=response.usage_metadata.total_token_count,
+        ),
+        "finish_reason": GoogleChatResponseAdapter.adapt_finish_reason(choice.finish_reason.name.lower(), tool_calls),
+    }
+
+
+class GoogleChatResponseAdapter(ChatResponse):
+    def __init__(self, response):
+        super().__init__(**_adapt_chat_response_fields(response))
 
     @staticmethod
     def adapt_finish_reason(finish_reason, tool_calls):
@@ -239,28 +375,7 @@ class GoogleChatResponseAdapter(ChatResponse):
 
 class GoogleChatResponseChunkAdapter(ChatResponse):
     def __init__(self, response):
-        choice = response.candidates[0]
-        tool_calls = [
-            ChatToolCall(
-                id=None,
-                function=Function(name=part.function_call.name, arguments=dict(part.function_call.args)),
-            )
-            for part in choice.content.parts
-            if "function_call" in part
-        ]
-        tool_calls = tool_calls if len(tool_calls) > 0 else None
-
-        super().__init__(
-            id=None,
-            usage=ChatUsage(
-                input_tokens=response.usage_metadata.prompt_token_count,
-                output_tokens=response.usage_metadata.candidates_token_count,
-                total_tokens=response.usage_metadata.total_token_count,
-            ),
-            message=ChatMessage(role="assistant", content=choice.content.parts[0].text),
-            tool_calls=tool_calls,
-            finish_reason=GoogleChatResponseAdapter.adapt_finish_reason(choice.finish_reason.name.lower(), tool_calls),
-        )
+        super().__init__(**_adapt_chat_response_fields(response, is_chunk=True))
 
 
 class GoogleEmbeddingResponseAdapter(EmbeddingResponse):
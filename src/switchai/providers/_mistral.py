@@ -1,10 +1,10 @@
-import copy
+import asyncio
+import importlib.util
 import json
-from typing import Union, List, Optional, Generator, Type
+import weakref
+from typing import Union, List, Optional, Generator, Type, AsyncGenerator, TYPE_CHECKING
 
-from PIL.Image import Image
-from anthropic import BaseModel
-from mistralai import Mistral
+import httpx
 
 from ..base_client import BaseClient
 from ..types import (
@@ -17,24 +17,79 @@ from ..types import (
     EmbeddingUsage,
     Embedding,
 )
-from ..utils import encode_image, is_url, inline_defs, Task
+from ..utils import (
+    encode_image,
+    is_url,
+    inline_defs,
+    get_cached_client,
+    get_cached_async_client,
+    freeze_supported_models,
+    Task,
+)
+
+try:
+    # Tool-call arguments are parsed on every streamed chunk, orjson is noticeably faster on these small payloads
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+if TYPE_CHECKING:
+    from PIL.Image import Image
+    from pydantic import BaseModel
+
+SUPPORTED_MODELS = freeze_supported_models(
+    {
+        "mistral-large-latest": [Task.TEXT_GENERATION],
+        "mistral-small-latest": [Task.TEXT_GENERATION],
+        "pixtral-large-latest": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
+        "pixtral-12b": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
+        "open-mistral-7b": [Task.TEXT_GENERATION],
+        "open-mixtral-8x7b": [Task.TEXT_GENERATION],
+        "open-mixtral-8x22b": [Task.TEXT_GENERATION],
+        "mistral-embed": [Task.TEXT_TO_EMBEDDING],
+    }
+)
+
+# Keep-alive pool limits, HTTP/2 is only used when the h2 package is installed
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=32)
+_USE_HTTP2 = importlib.util.find_spec("h2") is not None
+
+
+def _create_http_client():
+    return httpx.Client(http2=_USE_HTTP2, limits=_HTTP_LIMITS, follow_redirects=True)
+
 
-SUPPORTED_MODELS = {
-    "mistral-large-latest": [Task.TEXT_GENERATION],
-    "mistral-small-latest": [Task.TEXT_GENERATION],
-    "pixtral-large-latest": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
-    "pixtral-12b": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
-    "open-mistral-7b": [Task.TEXT_GENERATION, Task],
-    "open-mixtral-8x7b": [Task.TEXT_GENERATION, Task],
-    "open-mixtral-8x22b": [Task.TEXT_GENERATION, Task],
-    "mistral-embed": [Task.TEXT_TO_EMBEDDING],
-}
+def _create_mistral_client(api_key, http_client):
+    from mistralai import Mistral
+
+    return Mistral(api_key=api_key, client=http_client)
+
+
+def _create_mistral_async_client(api_key, http_client):
+    from mistralai import Mistral
+
+    # The sync transport is shared, so the SDK doesn't create an unused one for this client
+    return Mistral(
+        api_key=api_key,
+        client=http_client,
+        async_client=httpx.AsyncClient(http2=_USE_HTTP2, limits=_HTTP_LIMITS, follow_redirects=True),
+    )
 
 
 class MistralClientAdapter(BaseClient):
     def __init__(self, model_name: str, api_key: str):
         self.model_name = model_name
-        self.client = Mistral(api_key=api_key)
+        self._api_key = api_key
+        # The sync transport is owned here rather than by the SDK, so it is closed with the other cached clients
+        self._http_client = get_cached_client(_create_http_client)
+        self.client = get_cached_client(_create_mistral_client, api_key=api_key, http_client=self._http_client)
+
+    @property
+    def async_client(self):
+        # Created on first use and shared per event loop, so sync-only callers never pay for it
+        return get_cached_async_client(
+            _create_mistral_async_client, api_key=self._api_key, http_client=self._http_client
+        )
 
     def chat(
         self,
@@ -42,46 +97,65 @@ class MistralClientAdapter(BaseClient):
         temperature: Optional[float] = 1.0,
         max_tokens: Optional[int] = None,
         tools: Optional[List] = None,
-        response_format: Optional[Type[BaseModel]] = None,
+        response_format: Optional[Type["BaseModel"]] = None,
         stream: Optional[bool] = False,
     ) -> Union[ChatResponse, Generator[ChatResponse, None, None]]:
-        adapted_inputs = MistralChatInputsAdapter(messages, tools, response_format)
+        chat_kwargs = self._build_chat_kwargs(messages, temperature, max_tokens, tools, response_format)
 
         if stream:
-            response = self.client.chat.stream(
-                model=self.model_name,
-                messages=adapted_inputs.messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                tools=adapted_inputs.tools,
-                response_format={
-                    "type": "json_object",
-                }
-                if response_format is not None
-                else None,
-            )
+            response = self.client.chat.stream(**chat_kwargs)
             return self._stream_chat_response(response)
         else:
-            response = self.client.chat.complete(
-                model=self.model_name,
-                messages=adapted_inputs.messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                tools=adapted_inputs.tools,
-                response_format={
-                    "type": "json_object",
-                }
-                if response_format is not None
-                else None,
-            )
+            response = self.client.chat.complete(**chat_kwargs)
+            return MistralChatResponseAdapter.from_mistral_response(response)
 
-            return MistralChatResponseAdapter(response)
+    async def achat(
+        self,
+        messages: List[str | dict | ChatResponse],
+        temperature: Optional[float] = 1.0,
+        max_tokens: Optional[int] = None,
+        tools: Optional[List] = None,
+        response_format: Optional[Type["BaseModel"]] = None,
+        stream: Optional[bool] = False,
+    ) -> Union[ChatResponse, AsyncGenerator[ChatResponse, None]]:
+        chat_kwargs = self._build_chat_kwargs(messages, temperature, max_tokens, tools, response_format)
+
+        if stream:
+            response = await self.async_client.chat.stream_async(**chat_kwargs)
+            return self._astream_chat_response(response)
+        else:
+            response = await self.async_client.chat.complete_async(**chat_kwargs)
+            return MistralChatResponseAdapter.from_mistral_response(response)
+
+    def _build_chat_kwargs(self, messages, temperature, max_tokens, tools, response_format):
+        adapted_inputs = MistralChatInputsAdapter(messages, tools, response_format)
+
+        return {
+            "model": self.model_name,
+            "messages": adapted_inputs.messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "tools": adapted_inputs.tools,
+            "response_format": {
+                "type": "json_object",
+            }
+            if response_format is not None
+            else None,
+        }
 
     def _stream_chat_response(self, response):
         for chunk in response:
-            yield MistralChatResponseChunkAdapter(chunk.data)
+            if not chunk.data.choices and not chunk.data.usage:
+                continue
+            yield MistralChatResponseChunkAdapter.from_mistral_chunk(chunk.data)
+
+    async def _astream_chat_response(self, response):
+        async for chunk in response:
+            if not chunk.data.choices and not chunk.data.usage:
+                continue
+            yield MistralChatResponseChunkAdapter.from_mistral_chunk(chunk.data)
 
-    def embed(self, inputs: Union[str, Image, List[Union[str, Image]]]) -> EmbeddingResponse:
+    def embed(self, inputs: Union[str, "Image", List[Union[str, "Image"]]]) -> EmbeddingResponse:
         response = self.client.embeddings.create(
             model=self.model_name,
             inputs=inputs,
@@ -89,6 +163,98 @@ class MistralClientAdapter(BaseClient):
 
         return MistralEmbeddingResponseAdapter(response)
 
+    async def aembed(self, inputs: Union[str, "Image", List[Union[str, "Image"]]]) -> EmbeddingResponse:
+        response = await self.async_client.embeddings.create_async(
+            model=self.model_name,
+            inputs=inputs,
+        )
+
+        return MistralEmbeddingResponseAdapter(response)
+
+
+class MistralEmbeddingBatcher:
+    """
+    Coalesces concurrent single-input embedding requests into batched Mistral requests.
+
+    Inputs submitted within ``max_delay`` seconds of each other are sent together in one request, which is much
+    faster than sending many small requests when embedding inputs one at a time, for example in a RAG service.
+
+    Args:
+        client: The Mistral client adapter used to send the requests.
+        max_delay: The time, in seconds, to wait for more inputs before sending a batch. Defaults to 0.005.
+        max_batch_size: The maximum number of inputs sent in a single request. Defaults to 512.
+    """
+
+    def __init__(self, client: MistralClientAdapter, max_delay: float = 0.005, max_batch_size: int = 512):
+        self.client = client
+        self.max_delay = max_delay
+        self.max_batch_size = max_batch_size
+
+        self._pending = []
+        self._flush_handle = None
+        self._tasks = set()
+
+    async def embed(self, input: Union[str, "Image"]) -> List[float]:
+        """
+        Embeds a single input as part of the next batch.
+
+        Args:
+            input: The input to embed.
+
+        Returns:
+            List[float]: The embedding vector of the input.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((input, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_delay, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        pending, self._pending = self._pending, []
+        if pending:
+            # Keep a reference to the task so it is not garbage collected before it is done
+            task = asyncio.ensure_future(self._send(pending))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, pending):
+        try:
+            response = await self.client.aembed([input for input, _ in pending])
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for embedding in response.embeddings:
+            future = pending[embedding.index][1]
+            if not future.done():
+                future.set_result(embedding.data)
+
+
+# Schema prompts keyed by response format class, entries go away with the class itself
+_SCHEMA_PROMPT_CACHE = weakref.WeakKeyDictionary()
+
+
+def _format_schema_prompt(response_format):
+    schema_prompt = _SCHEMA_PROMPT_CACHE.get(response_format)
+    if schema_prompt is None:
+        schema = json.dumps(inline_defs(response_format.model_json_schema()))
+        schema_prompt = f"Return a short JSON object with the following schema: \n{schema}"
+        _SCHEMA_PROMPT_CACHE[response_format] = schema_prompt
+
+    return schema_prompt
+
 
 class MistralChatInputsAdapter:
     def __init__(self, messages, tools=None, response_format=None):
@@ -96,28 +262,27 @@ class MistralChatInputsAdapter:
 
         # Mistral don't support structured outputs out of the box, so prompting is needed
         if response_format is not None:
+            schema_prompt = _format_schema_prompt(response_format)
             if self.messages[0]["role"] != "system":
-                self.messages.insert(0, {"role": "system", "content": ""})
-
-            self.messages[0]["content"] = (
-                f'self.messages[0]["content"]\n'
-                f"Return a short JSON object with the following schema: \n"
-                f"{self._adapt_response_format(response_format)}"
-            )
+                self.messages.insert(0, {"role": "system", "content": schema_prompt})
+            else:
+                # Copy the system message so the caller's message is left untouched
+                system_message = dict(self.messages[0])
+                if system_message["content"]:
+                    system_message["content"] = f"{system_message['content']}\n{schema_prompt}"
+                else:
+                    system_message["content"] = schema_prompt
+                self.messages[0] = system_message
 
         self.tools = tools
 
     def _adapt_message(self, message):
+        # isinstance is kept here because provider response adapters subclass ChatResponse
         if isinstance(message, ChatResponse):
             return self._adapt_chat_response(message)
 
-        if message["role"] == "tool":
-            return self._adapt_tool_message(message)
-
-        if message["role"] == "user":
-            return self._adapt_user_message(message)
-
-        return message
+        handler = self._ROLE_HANDLERS.get(message["role"])
+        return handler(self, message) if handler is not None else message
 
     def _adapt_chat_response(self, chat_response):
         adapted_message = {
@@ -125,12 +290,14 @@ class MistralChatInputsAdapter:
             "content": chat_response.message.content,
         }
         if chat_response.tool_calls:
-            adapted_message["tool_calls"] = [tool_call.dict() for tool_call in chat_response.tool_calls]
+            adapted_message["tool_calls"] = [
+                tool_call.model_dump(exclude_none=True) for tool_call in chat_response.tool_calls
+            ]
 
         return adapted_message
 
     def _adapt_tool_message(self, message):
-        adapted_tool_message = copy.deepcopy(message)
+        adapted_tool_message = dict(message)
         adapted_tool_message["name"] = adapted_tool_message.pop("tool_name")
 
         return adapted_tool_message
@@ -161,36 +328,83 @@ class MistralChatInputsAdapter:
         base64_image = encode_image(image)
         return {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{base64_image}"}}
 
-    def _adapt_response_format(self, response_format):
-        response_format = response_format.model_json_schema()
-        response_format = inline_defs(response_format)
+    # Built once with the class, messages with other roles are passed through unchanged
+    _ROLE_HANDLERS = {
+        "tool": _adapt_tool_message,
+        "user": _adapt_user_message,
+    }
+
+
+def _build(model, validate, **fields):
+    # Responses coming from the SDK are already validated, so they are built without validation on the hot path
+    return model(**fields) if validate else model.model_construct(**fields)
+
 
-        return response_format
+def _str_or_none(value):
+    # Optional SDK fields hold an Unset sentinel when they are missing, which must not leak into the public types
+    return value if isinstance(value, str) else None
+
+
+def _int_or_none(value):
+    return value if isinstance(value, int) else None
+
+
+def _adapt_tool_calls(tool_calls, validate):
+    # Empty and missing tool calls (None or UNSET in the SDK) are both reported as None
+    if not tool_calls:
+        return None
+
+    adapted_tool_calls = []
+    for tool_call in tool_calls:
+        function = tool_call.function
+        adapted_tool_calls.append(
+            _build(
+                ChatToolCall,
+                validate,
+                id=_str_or_none(tool_call.id),
+                function=_build(Function, validate, name=function.name, arguments=json_loads(function.arguments)),
+            )
+        )
+
+    return adapted_tool_calls
+
+
+def _adapt_usage(usage, validate):
+    if not usage:
+        return None
+
+    return _build(
+        ChatUsage,
+        validate,
+        input_tokens=_int_or_none(usage.prompt_tokens),
+        output_tokens=_int_or_none(usage.completion_tokens),
+        total_tokens=_int_or_none(usage.total_tokens),
+    )
 
 
 class MistralChatResponseAdapter(ChatResponse):
     def __init__(self, response):
+        super().__init__(**self._adapt_response(response, validate=True))
+
+    @classmethod
+    def from_mistral_response(cls, response):
+        # The response is already validated by the Mistral SDK, so validation is skipped
+        return cls.model_construct(**cls._adapt_response(response, validate=False))
+
+    @classmethod
+    def _adapt_response(cls, response, validate):
         choice = response.choices[0]
+        message = choice.message
 
-        super().__init__(
-            id=response.id,
-            message=ChatMessage(role=choice.message.role, content=choice.message.content),
-            tool_calls=[
-                ChatToolCall(
-                    id=tool.id,
-                    function=Function(name=tool.function.name, arguments=json.loads(tool.function.arguments)),
-                )
-                for tool in choice.message.tool_calls
-            ]
-            if choice.message.tool_calls is not None
-            else None,
-            usage=ChatUsage(
-                input_tokens=response.usage.prompt_tokens,
-                output_tokens=response.usage.completion_tokens,
-                total_tokens=response.usage.total_tokens,
+        return {
+            "id": response.id,
+            "message": _build(
+                ChatMessage, validate, role=_str_or_none(message.role), content=_str_or_none(message.content)
             ),
-            finish_reason=self.adapt_finish_reason(choice.finish_reason),
-        )
+            "tool_calls": _adapt_tool_calls(message.tool_calls, validate),
+            "usage": _adapt_usage(response.usage, validate),
+            "finish_reason": cls.adapt_finish_reason(choice.finish_reason),
+        }
 
     @staticmethod
     def adapt_finish_reason(finish_reason):
@@ -206,32 +420,33 @@ class MistralChatResponseAdapter(ChatResponse):
 
 class MistralChatResponseChunkAdapter(ChatResponse):
     def __init__(self, response):
-        choice = response.choices[0]
-        tool_calls = [
-            ChatToolCall(
-                id=tool.id,
-                function=Function(name=tool.function.name, arguments=json.loads(tool.function.arguments)),
-            )
-            for tool in choice.delta.tool_calls
-        ]
-        tool_calls = tool_calls if len(tool_calls) > 0 else None
+        super().__init__(**self._adapt_chunk(response, validate=True))
 
-        super().__init__(
-            id=response.id,
-            usage=ChatUsage(
-                input_tokens=response.usage.prompt_tokens,
-                output_tokens=response.usage.completion_tokens,
-                total_tokens=response.usage.total_tokens,
-            )
-            if response.usage is not None
-            else None,
-            message=ChatMessage(
-                role=choice.delta.role if isinstance(choice.delta.role, str) else None,
-                content=choice.delta.content,
-            ),
-            tool_calls=tool_calls,
-            finish_reason=MistralChatResponseAdapter.adapt_finish_reason(choice.finish_reason),
+    @classmethod
+    def from_mistral_chunk(cls, response):
+        # The chunk is already validated by the Mistral SDK, so validation is skipped
+        return cls.model_construct(**cls._adapt_chunk(response, validate=False))
+
+    @staticmethod
+    def _adapt_chunk(response, validate):
+        adapted_chunk = {
+            "id": response.id,
+            "usage": _adapt_usage(response.usage, validate),
+        }
+
+        # The last chunk of a stream may only carry usage statistics
+        if not response.choices:
+            return adapted_chunk
+
+        choice = response.choices[0]
+        delta = choice.delta
+        adapted_chunk["message"] = _build(
+            ChatMessage, validate, role=_str_or_none(delta.role), content=_str_or_none(delta.content)
         )
+        adapted_chunk["tool_calls"] = _adapt_tool_calls(delta.tool_calls, validate)
+        adapted_chunk["finish_reason"] = MistralChatResponseAdapter.adapt_finish_reason(choice.finish_reason)
+
+        return adapted_chunk
 
 
 class MistralEmbeddingResponseAdapter(EmbeddingResponse):
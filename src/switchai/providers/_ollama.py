@@ -1,39 +1,46 @@
-from typing import Union, List, Optional, Type, Generator
+from typing import Union, List, Optional, Type, Generator, AsyncGenerator
 
 from PIL.Image import Image
-from ollama import Client
+from ollama import Client, AsyncClient
 from pydantic import BaseModel
 
 from ..base_client import BaseClient
 from ..types import EmbeddingResponse, ChatResponse, ChatMessage, ChatToolCall, Function, Embedding
-from ..utils import Task, is_url, encode_image
-
-SUPPORTED_MODELS = {
-    "llama3.2": [Task.TEXT_GENERATION],
-    "llama3.2:1b": [Task.TEXT_GENERATION],
-    "llama3.2-vision": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
-    "llama3.3": [Task.TEXT_GENERATION],
-    "mistral": [Task.TEXT_GENERATION],
-    "deepseek-r1:1.5b": [Task.TEXT_GENERATION],
-    "deepseek-r1:7b": [Task.TEXT_GENERATION],
-    "deepseek-r1:8b": [Task.TEXT_GENERATION],
-    "deepseek-r1:14b": [Task.TEXT_GENERATION],
-    "deepseek-r1:32b": [Task.TEXT_GENERATION],
-    "deepseek-r1:70b": [Task.TEXT_GENERATION],
-    "deepseek-r1:671b": [Task.TEXT_GENERATION],
-    "phi4": [Task.TEXT_GENERATION],
-    "llava": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
-    "llava:13b": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
-    "llava:34b": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
-    "nomic-embed-text": [Task.TEXT_TO_EMBEDDING],
-    "mxbai-embed-large": [Task.TEXT_TO_EMBEDDING],
-}
+from ..utils import freeze_supported_models, Task, is_url, encode_image, get_cached_client, get_cached_async_client
+
+SUPPORTED_MODELS = freeze_supported_models(
+    {
+        "llama3.2": [Task.TEXT_GENERATION],
+        "llama3.2:1b": [Task.TEXT_GENERATION],
+        "llama3.2-vision": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
+        "llama3.3": [Task.TEXT_GENERATION],
+        "mistral": [Task.TEXT_GENERATION],
+        "deepseek-r1:1.5b": [Task.TEXT_GENERATION],
+        "deepseek-r1:7b": [Task.TEXT_GENERATION],
+        "deepseek-r1:8b": [Task.TEXT_GENERATION],
+        "deepseek-r1:14b": [Task.TEXT_GENERATION],
+        "deepseek-r1:32b": [Task.TEXT_GENERATION],
+        "deepseek-r1:70b": [Task.TEXT_GENERATION],
+        "deepseek-r1:671b": [Task.TEXT_GENERATION],
+        "phi4": [Task.TEXT_GENERATION],
+        "llava": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
+        "llava:13b": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
+        "llava:34b": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
+        "nomic-embed-text": [Task.TEXT_TO_EMBEDDING],
+        "mxbai-embed-large": [Task.TEXT_TO_EMBEDDING],
+    }
+)
 
 
 class OllamaClientAdapter(BaseClient):
     def __init__(self, model_name: str, api_key: str):
         self.model_name = model_name
-        self.client = Client(host="http://localhost:11434")
+        self.client = get_cached_client(Client, host="http://localhost:11434")
+
+    @property
+    def async_client(self):
+        # Created on first use and shared per event loop, so sync-only callers never pay for it
+        return get_cached_async_client(AsyncClient, host="http://localhost:11434")
 
     def chat(
         self,
@@ -44,15 +51,8 @@ class OllamaClientAdapter(BaseClient):
         response_format: Optional[Type[BaseModel]] = None,
         stream: Optional[bool] = False,
     ) -> Union[ChatResponse, Generator[ChatResponse, None, None]]:
-        adapted_inputs = OllamaChatInputsAdapter(messages, tools, response_format)
-
         response = self.client.chat(
-            messages=adapted_inputs.messages,
-            model=self.model_name,
-            tools=adapted_inputs.tools,
-            options={"temperature": temperature},
-            format=adapted_inputs.response_format,
-            stream=stream,
+            **self._build_chat_kwargs(messages, temperature, max_tokens, tools, response_format, stream)
         )
 
         if stream:
@@ -60,9 +60,42 @@ class OllamaClientAdapter(BaseClient):
         else:
             return OllamaChatResponseAdapter(response)
 
+    async def achat(
+        self,
+        messages: List[str | dict | ChatResponse],
+        temperature: Optional[float] = 1.0,
+        max_tokens: Optional[int] = None,
+        tools: Optional[List] = None,
+        response_format: Optional[Type[BaseModel]] = None,
+        stream: Optional[bool] = False,
+    ) -> Union[ChatResponse, AsyncGenerator[ChatResponse, None]]:
+        response = await self.async_client.chat(
+            **self._build_chat_kwargs(messages, temperature, max_tokens, tools, response_format, stream)
+        )
+
+        if stream:
+            return self._astream_chat_response(response)
+        else:
+            return OllamaChatResponseAdapter(response)
+
+    def _build_chat_kwargs(self, messages, temperature, max_tokens, tools, response_format, stream):
+        adapted_inputs = OllamaChatInputsAdapter(messages, tools, response_format)
+
+        return {
+            "messages": adapted_inputs.messages,
+            "model": self.model_name,
+            "tools": adapted_inputs.tools,
+            "options": {"temperature": temperature},
+            "format": adapted_inputs.response_format,
+            "stream": stream,
+        }
+
     def _stream_chat_response(self, response):
         for chunk in response:
-            print(chunk)
+            yield OllamaChatResponseChunkAdapter(chunk)
+
+    async def _astream_chat_response(self, response):
+        async for chunk in response:
             yield OllamaChatResponseChunkAdapter(chunk)
 
     def embed(self, inputs: Union[str, Image, List[Union[str, Image]]]) -> EmbeddingResponse:
@@ -70,6 +103,11 @@ class OllamaClientAdapter(BaseClient):
 
         return OllamaEmbeddingResponseAdapter(response)
 
+    async def aembed(self, inputs: Union[str, Image, List[Union[str, Image]]]) -> EmbeddingResponse:
+        response = await self.async_client.embed(input=inputs, model=self.model_name)
+
+        return OllamaEmbeddingResponseAdapter(response)
+
 
 class OllamaChatInputsAdapter:
     def __init__(self, messages, tools=None, response_format=None):
@@ -92,10 +130,14 @@ class OllamaChatInputsAdapter:
             "content": chat_response.message.content,
         }
         if chat_response.tool_calls:
-            adapted_tools = [tool_call.dict() for tool_call in chat_response.tool_calls]
-            for tool in adapted_tools:
-                tool["function"]["arguments"] = tool["function"]["arguments"]
-            adapted_message["tool_calls"] = adapted_tools
+            adapted_message["tool_calls"] = [
+                {
+                    "id": tool_call.id,
+                    "type": tool_call.type,
+                    "function": {"name": tool_call.function.name, "arguments": tool_call.function.arguments},
+                }
+                for tool_call in chat_response.tool_calls
+            ]
         return adapted_message
 
     def _adapt_user_message(self, message):
@@ -167,7 +209,6 @@ class OllamaChatResponseChunkAdapter(ChatResponse):
 
 class OllamaEmbeddingResponseAdapter(EmbeddingResponse):
     def __init__(self, response):
-        print(response)
         super().__init__(
             usage=None,
             embeddings=[
@@ -1,11 +1,11 @@
 import json
+import time
 from io import BytesIO
-from typing import List, Optional, Union, Generator, Type
+from typing import List, Optional, Union, Generator, Type, AsyncGenerator
 
 import PIL
-import httpx
 from PIL.Image import Image
-from openai import NOT_GIVEN, OpenAI
+from openai import NOT_GIVEN, OpenAI, AsyncOpenAI
 from pydantic import BaseModel
 
 from ..base_client import BaseClient
@@ -21,28 +21,46 @@ from ..types import (
     TranscriptionResponse,
     ImageGenerationResponse,
 )
-from ..utils import is_url, encode_image, inline_defs, Task
+from ..utils import (
+    is_url,
+    encode_image,
+    inline_defs,
+    download_files,
+    get_cached_client,
+    get_cached_async_client,
+    freeze_supported_models,
+    Task,
+    UPLOAD_BUFFER_SIZE,
+)
 
 
-SUPPORTED_MODELS = {
-    "gpt-4o": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
-    "gpt-4o-mini": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
-    "o1-preview": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
-    "o1-mini": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
-    "gpt-4": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
-    "text-embedding-ada-002": [Task.TEXT_TO_EMBEDDING],
-    "text-embedding-3-small": [Task.TEXT_TO_EMBEDDING],
-    "text-embedding-3-large": [Task.TEXT_TO_EMBEDDING],
-    "whisper-1": [Task.AUDIO_TO_TEXT],
-    "dall-e-3": [Task.TEXT_TO_IMAGE],
-    "dall-e-2": [Task.TEXT_TO_IMAGE],
-}
+SUPPORTED_MODELS = freeze_supported_models(
+    {
+        "gpt-4o": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
+        "gpt-4o-mini": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
+        "o1-preview": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
+        "o1-mini": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
+        "gpt-4": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
+        "text-embedding-ada-002": [Task.TEXT_TO_EMBEDDING],
+        "text-embedding-3-small": [Task.TEXT_TO_EMBEDDING],
+        "text-embedding-3-large": [Task.TEXT_TO_EMBEDDING],
+        "whisper-1": [Task.AUDIO_TO_TEXT],
+        "dall-e-3": [Task.TEXT_TO_IMAGE],
+        "dall-e-2": [Task.TEXT_TO_IMAGE],
+    }
+)
 
 
 class OpenaiClientAdapter(BaseClient):
     def __init__(self, model_name: str, api_key: str):
         self.model_name = model_name
-        self.client = OpenAI(api_key=api_key)
+        self._client_kwargs = {"api_key": api_key}
+        self.client = get_cached_client(OpenAI, **self._client_kwargs)
+
+    @property
+    def async_client(self):
+        # Created on first use and shared per event loop, so sync-only callers never pay for it
+        return get_cached_async_client(AsyncOpenAI, **self._client_kwargs)
 
     def chat(
         self,
@@ -53,16 +71,8 @@ class OpenaiClientAdapter(BaseClient):
         response_format: Optional[Type[BaseModel]] = None,
         stream: Optional[bool] = False,
     ) -> Union[ChatResponse, Generator[ChatResponse, None, None]]:
-        adapted_inputs = OpenaiChatInputsAdapter(messages, tools, response_format)
-
         response = self.client.chat.completions.create(
-            model=self.model_name,
-            messages=adapted_inputs.messages,
-            temperature=temperature,
-            max_completion_tokens=max_tokens,
-            tools=adapted_inputs.tools,
-            response_format=adapted_inputs.response_format,
-            stream=stream,
+            **self._build_chat_kwargs(messages, temperature, max_tokens, tools, response_format, stream)
         )
 
         if stream:
@@ -70,23 +80,122 @@ class OpenaiClientAdapter(BaseClient):
         else:
             return OpenaiChatResponseAdapter(response)
 
+    async def achat(
+        self,
+        messages: List[str | dict | ChatResponse],
+        temperature: Optional[float] = 1.0,
+        max_tokens: Optional[int] = None,
+        tools: Optional[List] = None,
+        response_format: Optional[Type[BaseModel]] = None,
+        stream: Optional[bool] = False,
+    ) -> Union[ChatResponse, AsyncGenerator[ChatResponse, None]]:
+        response = await self.async_client.chat.completions.create(
+            **self._build_chat_kwargs(messages, temperature, max_tokens, tools, response_format, stream)
+        )
+
+        if stream:
+            return self._astream_chat_response(response)
+        else:
+            return OpenaiChatResponseAdapter(response)
+
+    def _build_chat_kwargs(self, messages, temperature, max_tokens, tools, response_format, stream):
+        adapted_inputs = OpenaiChatInputsAdapter(messages, tools, response_format)
+
+        return {
+            "model": self.model_name,
+            "messages": adapted_inputs.messages,
+            "temperature": temperature,
+            "max_completion_tokens": max_tokens,
+            "tools": adapted_inputs.tools,
+            "response_format": adapted_inputs.response_format,
+            "stream": stream,
+        }
+
     def _stream_chat_response(self, response):
         for chunk in response:
             yield OpenaiChatResponseChunkAdapter(chunk)
 
+    async def _astream_chat_response(self, response):
+        async for chunk in response:
+            yield OpenaiChatResponseChunkAdapter(chunk)
+
     def embed(self, inputs: Union[str, Image, List[Union[str, Image]]]) -> EmbeddingResponse:
         response = self.client.embeddings.create(input=inputs, model=self.model_name)
 
         return OpenaiEmbeddingResponseAdapter(response)
 
+    async def aembed(self, inputs: Union[str, Image, List[Union[str, Image]]]) -> EmbeddingResponse:
+        response = await self.async_client.embeddings.create(input=inputs, model=self.model_name)
+
+        return OpenaiEmbeddingResponseAdapter(response)
+
+    def embed_batch_file(self, inputs: List[str], poll_interval: float = 30.0) -> EmbeddingResponse:
+        requests = [
+            json.dumps(
+                {
+                    "custom_id": str(index),
+                    "method": "POST",
+                    "url": "/v1/embeddings",
+                    "body": {"model": self.model_name, "input": text},
+                }
+            )
+            for index, text in enumerate(inputs)
+        ]
+        batch_file = self.client.files.create(
+            file=("embeddings.jsonl", "\n".join(requests).encode("utf-8")), purpose="batch"
+        )
+
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id, endpoint="/v1/embeddings", completion_window="24h"
+        )
+        while batch.status not in ["completed", "failed", "expired", "cancelled"]:
+            time.sleep(poll_interval)
+            batch = self.client.batches.retrieve(batch.id)
+
+        if batch.status != "completed":
+            raise RuntimeError(f"OpenAI batch '{batch.id}' did not complete, its status is '{batch.status}'.")
+
+        # Failed requests are written to a separate error file, a completed batch can still be missing embeddings
+        failed_count = batch.request_counts.failed if batch.request_counts is not None else 0
+        if failed_count or batch.error_file_id is not None or batch.output_file_id is None:
+            raise RuntimeError(
+                f"OpenAI batch '{batch.id}' completed with {failed_count} failed request(s): "
+                f"{self._read_batch_error(batch)}"
+            )
+
+        results = [json.loads(line) for line in self.client.files.content(batch.output_file_id).text.splitlines()]
+
+        return OpenaiBatchEmbeddingResponseAdapter(results)
+
+    def _read_batch_error(self, batch):
+        if batch.error_file_id is None:
+            return "no error details were returned"
+
+        error_lines = self.client.files.content(batch.error_file_id).text.splitlines()
+        if not error_lines:
+            return "no error details were returned"
+
+        # Each line holds either a request level error or the failed response of the request
+        first_error = json.loads(error_lines[0])
+        error = first_error.get("error") or (first_error.get("response") or {}).get("body", {}).get("error") or {}
+        return f"request {first_error.get('custom_id')}: {error.get('message', 'unknown error')}"
+
     def transcribe(self, audio_path: str, language: Optional[str] = None) -> TranscriptionResponse:
-        with open(audio_path, "rb") as audio_file:
+        with open(audio_path, "rb", buffering=UPLOAD_BUFFER_SIZE) as audio_file:
             response = self.client.audio.transcriptions.create(
                 model=self.model_name, file=audio_file, language=language
             )
 
         return OpenaiTranscriptionResponseAdapter(response)
 
+    async def atranscribe(self, audio_path: str, language: Optional[str] = None) -> TranscriptionResponse:
+        with open(audio_path, "rb", buffering=UPLOAD_BUFFER_SIZE) as audio_file:
+            response = await self.async_client.audio.transcriptions.create(
+                model=self.model_name, file=audio_file, language=language
+            )
+
+        return OpenaiTranscriptionResponseAdapter(response)
+
     def generate_image(self, prompt: str, n: Optional[int] = 1) -> ImageGenerationResponse:
         response = self.client.images.generate(model=self.model_name, prompt=prompt, n=n)
 
@@ -114,10 +223,17 @@ class OpenaiChatInputsAdapter:
             "content": chat_response.message.content,
         }
         if chat_response.tool_calls:
-            adapted_tools = [tool_call.dict() for tool_call in chat_response.tool_calls]
-            for tool in adapted_tools:
-                tool["function"]["arguments"] = str(tool["function"]["arguments"])
-            adapted_message["tool_calls"] = adapted_tools
+            adapted_message["tool_calls"] = [
+                {
+                    "id": tool_call.id,
+                    "type": tool_call.type,
+                    "function": {
+                        "name": tool_call.function.name,
+                        "arguments": json.dumps(tool_call.function.arguments),
+                    },
+                }
+                for tool_call in chat_response.tool_calls
+            ]
         return adapted_message
 
     def _adapt_user_message(self, message):
@@ -253,6 +369,37 @@ class OpenaiEmbeddingResponseAdapter(EmbeddingResponse):
         )
 
 
+class OpenaiBatchEmbeddingResponseAdapter(EmbeddingResponse):
+    def __init__(self, results):
+        embeddings = []
+        input_tokens = 0
+        total_tokens = 0
+        model = None
+        for result in results:
+            if result["error"] is not None or result["response"]["status_code"] != 200:
+                raise RuntimeError(f"OpenAI batch request '{result['custom_id']}' failed: {result}")
+
+            body = result["response"]["body"]
+            model = body["model"]
+            input_tokens += body["usage"]["prompt_tokens"]
+            total_tokens += body["usage"]["total_tokens"]
+            embeddings.append(Embedding(index=int(result["custom_id"]), data=body["data"][0]["embedding"]))
+
+        # Batch results are not guaranteed to be returned in the same order as the requests
+        embeddings.sort(key=lambda embedding: embedding.index)
+
+        super().__init__(
+            id=None,
+            object="list",
+            model=model,
+            usage=EmbeddingUsage(
+                input_tokens=input_tokens,
+                total_tokens=total_tokens,
+            ),
+            embeddings=embeddings,
+        )
+
+
 class OpenaiTranscriptionResponseAdapter(TranscriptionResponse):
     def __init__(self, response):
         super().__init__(text=response.text)
@@ -260,10 +407,9 @@ class OpenaiTranscriptionResponseAdapter(TranscriptionResponse):
 
 class OpenaiImageGenerationResponseAdapter(ImageGenerationResponse):
     def __init__(self, response):
-        images = []
-        for image in response.data:
-            downloaded_image = httpx.get(image.url)
-            pil_image = PIL.Image.open(BytesIO(downloaded_image.content))
-            images.append(pil_image)
+        images = [
+            PIL.Image.open(BytesIO(downloaded_image))
+            for downloaded_image in download_files([image.url for image in response.data])
+        ]
 
         super().__init__(images=images)
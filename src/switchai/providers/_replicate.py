@@ -1,25 +1,36 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from PIL import Image
 
 from ..base_client import BaseClient
 from ..types import ImageGenerationResponse, TranscriptionResponse
-from ..utils import Task
+from ..utils import get_cached_client, get_cached_async_client, freeze_supported_models, Task
 
 from replicate.client import Client
 
 
-SUPPORTED_MODELS = {
-    "openai/whisper": [Task.AUDIO_TO_TEXT],
-    "black-forest-labs/flux-schnell": [Task.TEXT_TO_IMAGE],
-    "stability-ai/sdxl": [Task.TEXT_TO_IMAGE],
-}
+SUPPORTED_MODELS = freeze_supported_models(
+    {
+        "openai/whisper": [Task.AUDIO_TO_TEXT],
+        "black-forest-labs/flux-schnell": [Task.TEXT_TO_IMAGE],
+        "stability-ai/sdxl": [Task.TEXT_TO_IMAGE],
+    }
+)
 
 
 class ReplicateClientAdapter(BaseClient):
     def __init__(self, model_name: str, api_key: str):
         self.model_name = model_name
-        self.client = Client(api_token=api_key)
+        self._api_key = api_key
+        self.client = get_cached_client(Client, api_token=api_key)
+
+    @property
+    def async_client(self):
+        # The SDK keeps its async transport on the client, which binds it to an event loop,
+        # so a separate client is created on first use and shared per event loop
+        return get_cached_async_client(Client, api_token=self._api_key)
 
     def generate_image(self, prompt: str, n: Optional[int] = 1) -> ImageGenerationResponse:
         latest_version_id = self.client.models.get(self.model_name).latest_version.id
@@ -40,6 +51,16 @@ class ReplicateClientAdapter(BaseClient):
 
         return ReplicateTranscriptionResponseAdapter(response)
 
+    async def atranscribe(self, audio_path: str, language: Optional[str] = None) -> TranscriptionResponse:
+        latest_version_id = (await self.async_client.models.async_get(self.model_name)).latest_version.id
+        with open(audio_path, "rb") as audio_file:
+            response = await self.async_client.async_run(
+                ref=f"{self.model_name}:{latest_version_id}",
+                input={"audio": audio_file, "language": language if language else "auto"},
+            )
+
+        return ReplicateTranscriptionResponseAdapter(response)
+
 
 class ReplicateTranscriptionResponseAdapter(TranscriptionResponse):
     def __init__(self, response):
@@ -48,9 +69,17 @@ class ReplicateTranscriptionResponseAdapter(TranscriptionResponse):
 
 class ReplicateImageGenerationResponseAdapter(ImageGenerationResponse):
     def __init__(self, response):
-        images = []
-        for image_file in response:
-            pil_image = Image.open(image_file)
-            images.append(pil_image)
+        image_files = list(response)
+
+        # Each output is fetched over the network when read, so the reads are overlapped
+        if len(image_files) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(image_files))) as executor:
+                images = list(executor.map(self._read_image, image_files))
+        else:
+            images = [self._read_image(image_file) for image_file in image_files]
 
         super().__init__(images=images)
+
+    @staticmethod
+    def _read_image(image_file):
+        return Image.open(io.BytesIO(image_file.read()))
@@ -5,24 +5,32 @@ from PIL.Image import Image
 
 from ..base_client import BaseClient
 from ..types import EmbeddingResponse, EmbeddingUsage, Embedding
-from ..utils import Task
+from ..utils import get_cached_client, get_cached_async_client, freeze_supported_models, Task
 
-SUPPORTED_MODELS = {
-    "voyage-3-large": [Task.TEXT_TO_EMBEDDING],
-    "voyage-3": [Task.TEXT_TO_EMBEDDING],
-    "voyage-3-lite": [Task.TEXT_TO_EMBEDDING],
-    "voyage-code-3": [Task.TEXT_TO_EMBEDDING],
-    "voyage-finance-2": [Task.TEXT_TO_EMBEDDING],
-    "voyage-law-2": [Task.TEXT_TO_EMBEDDING],
-    "voyage-code-2": [Task.TEXT_TO_EMBEDDING],
-    "voyage-multimodal-3": [Task.IMAGE_TEXT_TO_EMBEDDING],
-}
+SUPPORTED_MODELS = freeze_supported_models(
+    {
+        "voyage-3-large": [Task.TEXT_TO_EMBEDDING],
+        "voyage-3": [Task.TEXT_TO_EMBEDDING],
+        "voyage-3-lite": [Task.TEXT_TO_EMBEDDING],
+        "voyage-code-3": [Task.TEXT_TO_EMBEDDING],
+        "voyage-finance-2": [Task.TEXT_TO_EMBEDDING],
+        "voyage-law-2": [Task.TEXT_TO_EMBEDDING],
+        "voyage-code-2": [Task.TEXT_TO_EMBEDDING],
+        "voyage-multimodal-3": [Task.IMAGE_TEXT_TO_EMBEDDING],
+    }
+)
 
 
 class VoyageaiClientAdapter(BaseClient):
     def __init__(self, model_name: str, api_key: str):
         self.model_name = model_name
-        self.client = voyageai.Client(api_key=api_key)
+        self._api_key = api_key
+        self.client = get_cached_client(voyageai.Client, api_key=api_key)
+
+    @property
+    def async_client(self):
+        # Created on first use and shared per event loop, so sync-only callers never pay for it
+        return get_cached_async_client(voyageai.AsyncClient, api_key=self._api_key)
 
     def embed(self, inputs: Union[str, Image, List[Union[str, Image]]]) -> EmbeddingResponse:
         if Task.TEXT_TO_EMBEDDING in SUPPORTED_MODELS[self.model_name]:
@@ -37,6 +45,34 @@ class VoyageaiClientAdapter(BaseClient):
 
         return VoyageaiEmbeddingResponseAdapter(response)
 
+    async def aembed(self, inputs: Union[str, Image, List[Union[str, Image]]]) -> EmbeddingResponse:
+        if Task.TEXT_TO_EMBEDDING in SUPPORTED_MODELS[self.model_name]:
+            response = await self.async_client.embed(inputs, model=self.model_name)
+        else:
+            if isinstance(inputs, str) or isinstance(inputs, Image):
+                inputs = [[inputs]]
+            else:
+                inputs = [inputs]
+
+            response = await self.async_client.multimodal_embed(inputs, model=self.model_name)
+
+        return VoyageaiEmbeddingResponseAdapter(response)
+
+    def embed_each(self, inputs: List[Union[str, Image]]) -> EmbeddingResponse:
+        # Multimodal models read a list as a single interleaved input, so each item is wrapped on its own
+        if Task.TEXT_TO_EMBEDDING in SUPPORTED_MODELS[self.model_name]:
+            return self.embed(inputs)
+
+        response = self.client.multimodal_embed([[item] for item in inputs], model=self.model_name)
+        return VoyageaiEmbeddingResponseAdapter(response)
+
+    async def aembed_each(self, inputs: List[Union[str, Image]]) -> EmbeddingResponse:
+        if Task.TEXT_TO_EMBEDDING in SUPPORTED_MODELS[self.model_name]:
+            return await self.aembed(inputs)
+
+        response = await self.async_client.multimodal_embed([[item] for item in inputs], model=self.model_name)
+        return VoyageaiEmbeddingResponseAdapter(response)
+
 
 class VoyageaiEmbeddingResponseAdapter(EmbeddingResponse):
     def __init__(self, response):
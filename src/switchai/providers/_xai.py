@@ -1,15 +1,18 @@
 from openai import OpenAI
 
 from ._openai import OpenaiClientAdapter
-from ..utils import Task
+from ..utils import get_cached_client, freeze_supported_models, Task
 
-SUPPORTED_MODELS = {
-    "grok-beta": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
-    "grok-vision-beta": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
-}
+SUPPORTED_MODELS = freeze_supported_models(
+    {
+        "grok-beta": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
+        "grok-vision-beta": [Task.TEXT_GENERATION, Task.IMAGE_TEXT_TO_TEXT],
+    }
+)
 
 
 class XaiClientAdapter(OpenaiClientAdapter):
     def __init__(self, model_name: str, api_key: str):
         self.model_name = model_name
-        self.client = OpenAI(api_key=api_key, base_url="https://api.x.ai/v1")
+        self._client_kwargs = {"api_key": api_key, "base_url": "https://api.x.ai/v1"}
+        self.client = get_cached_client(OpenAI, **self._client_kwargs)
@@ -53,12 +53,10 @@ class Browser(BaseClient):
         response_format: Optional[Type[BaseModel]] = None,
         stream: Optional[bool] = False,
     ) -> Union[ChatResponse, Generator[ChatResponse, None, None]]:
-        if tools is None:
-            tools = []
-        if len(tools) > 0:
+        if tools:
             raise ValueError("Browser does not accept tools.")
 
-        tools.append(
+        tools = [
             {
                 "type": "function",
                 "function": {
@@ -72,13 +70,13 @@ class Browser(BaseClient):
                     },
                 },
             }
-        )
+        ]
 
         first_response = self.client.chat(messages, temperature, max_tokens, tools)
 
         tool_calls = first_response.tool_calls
         if tool_calls:
-            messages.append(first_response)
+            messages = [*messages, first_response]
             for tool_call in tool_calls:
                 if tool_call.function.name == "get_website":
                     function_args = tool_call.function.arguments
@@ -1,4 +1,3 @@
-import importlib
 import json
 from pathlib import Path
 from typing import Optional, Union, Dict
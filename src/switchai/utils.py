@@ -1,13 +1,43 @@
+import asyncio
 import base64
+import functools
 import io
+import logging
 import re
-from typing import Any, Union
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Union
 
 import PIL
+import httpx
 from PIL.Image import Image
 
 from enum import Enum
 
+try:
+    # SIMD accelerated base64, which matters for the large image payloads sent to vision models
+    from pybase64 import b64encode_as_string
+except ImportError:
+
+    def b64encode_as_string(data: bytes) -> str:
+        return base64.b64encode(data).decode("ascii")
+
+
+logger = logging.getLogger("switchai")
+
+# Read size used when streaming local files to a provider, larger than the default 8 KiB
+# so that big audio uploads need far fewer read calls.
+UPLOAD_BUFFER_SIZE = 1 << 20
+
+# Provider SDK clients shared by all SwitchAI instances, keyed by client class and constructor arguments
+_CLIENT_CACHE = {}
+_CLIENT_CACHE_LOCK = threading.Lock()
+
+# Async SDK clients are bound to the event loop they first run on, so they are shared per running loop
+_ASYNC_CLIENT_CACHE = weakref.WeakKeyDictionary()
+
 
 class Task(Enum):
     TEXT_GENERATION = "text_generation"
@@ -21,6 +51,103 @@ class Task(Enum):
     AUDIO_TO_TEXT = "audio_to_text"
 
 
+def freeze_supported_models(supported_models: Dict[str, List[Task]]) -> Mapping[str, frozenset]:
+    """
+    Makes a provider's table of supported models read-only, storing the tasks of each model in a frozenset.
+
+    Args:
+        supported_models (Dict[str, List[Task]]): The supported models mapped to their tasks.
+
+    Returns:
+        Mapping[str, frozenset]: A read-only view of the table.
+    """
+    return MappingProxyType({model_name: frozenset(tasks) for model_name, tasks in supported_models.items()})
+
+
+def get_cached_client(client_class: type, **kwargs) -> Any:
+    """
+    Returns a provider SDK client created with the given arguments, reusing a previously created one if possible.
+
+    Sharing clients lets every SwitchAI instance that uses the same credentials reuse the client's pool of
+    keep-alive connections, instead of opening new ones.
+
+    Args:
+        client_class (type): The SDK client class.
+        **kwargs: The arguments to pass to the client constructor.
+
+    Returns:
+        Any: The client instance.
+    """
+    key = (client_class, tuple(sorted(kwargs.items())))
+    with _CLIENT_CACHE_LOCK:
+        client = _CLIENT_CACHE.get(key)
+        if client is None:
+            client = client_class(**kwargs)
+            _CLIENT_CACHE[key] = client
+
+    return client
+
+
+def get_cached_async_client(client_class: type, **kwargs) -> Any:
+    """
+    Returns an async provider SDK client for the running event loop, reusing a previously created one if possible.
+
+    Async clients can't be shared across event loops, so each loop gets its own client, which is created on first
+    use and dropped together with the loop. This must be called from a coroutine.
+
+    Args:
+        client_class (type): The async SDK client class.
+        **kwargs: The arguments to pass to the client constructor.
+
+    Returns:
+        Any: The client instance.
+    """
+    loop = asyncio.get_running_loop()
+    key = (client_class, tuple(sorted(kwargs.items())))
+    with _CLIENT_CACHE_LOCK:
+        loop_clients = _ASYNC_CLIENT_CACHE.get(loop)
+        if loop_clients is None:
+            loop_clients = _ASYNC_CLIENT_CACHE[loop] = {}
+
+        client = loop_clients.get(key)
+        if client is None:
+            client = client_class(**kwargs)
+            loop_clients[key] = client
+
+    return client
+
+
+def close_cached_clients() -> None:
+    """
+    Closes and forgets all the clients created by ``get_cached_client``.
+
+    Clients are closed with their ``close`` method, or as a context manager when they have none. Clients whose SDK
+    offers neither, like Replicate, Voyage AI and Deepgram, are only forgotten: their connections are released when
+    they are garbage collected. Async clients, which are bound to an event loop, are left to their loop.
+    """
+    with _CLIENT_CACHE_LOCK:
+        clients = list(_CLIENT_CACHE.values())
+        _CLIENT_CACHE.clear()
+
+    for client in clients:
+        close = getattr(client, "close", None)
+        if callable(close):
+            close()
+        elif hasattr(client, "__exit__"):
+            client.__exit__(None, None, None)
+
+
+@functools.lru_cache(maxsize=128)
+def warn_once(message: str) -> None:
+    """
+    Logs a warning message on the ``switchai`` logger, only the first time it is emitted.
+
+    Args:
+        message (str): The warning message.
+    """
+    logger.warning(message)
+
+
 def encode_image(image_input: Union[str, bytes, Image]) -> str:
     """
     Encodes an image into a base64 string with PNG encoding.
@@ -45,7 +172,73 @@ def encode_image(image_input: Union[str, bytes, Image]) -> str:
     buffered = io.BytesIO()
     image.save(buffered, format="PNG")
     png_bytes = buffered.getvalue()
-    return base64.b64encode(png_bytes).decode("utf-8")
+    return b64encode_as_string(png_bytes)
+
+
+def get_image_mime_type(image_bytes: bytes) -> Optional[str]:
+    """
+    Detects the format of encoded image bytes from their magic number.
+
+    Args:
+        image_bytes (bytes): The raw image bytes.
+
+    Returns:
+        Optional[str]: The MIME type of the image if it is a JPEG, PNG or WEBP image, None otherwise.
+    """
+    if image_bytes.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if image_bytes.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if image_bytes[:4] == b"RIFF" and image_bytes[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _get_http_client() -> httpx.Client:
+    # Shared across calls so downloads reuse pooled keep-alive connections
+    return httpx.Client(timeout=30, limits=httpx.Limits(max_keepalive_connections=20))
+
+
+def download_files(urls: List[str]) -> List[bytes]:
+    """
+    Downloads the content of the given URLs concurrently, using a shared connection pool.
+
+    Args:
+        urls (List[str]): The URLs to download.
+
+    Returns:
+        List[bytes]: The content of each URL, in the same order as the input.
+    """
+    if not urls:
+        return []
+
+    http_client = _get_http_client()
+    if len(urls) == 1:
+        return [http_client.get(urls[0]).content]
+
+    with ThreadPoolExecutor(max_workers=min(8, len(urls))) as executor:
+        return [response.content for response in executor.map(http_client.get, urls)]
+
+
+async def adownload_files(urls: List[str]) -> List[bytes]:
+    """
+    Downloads the content of the given URLs concurrently without blocking the event loop.
+
+    Args:
+        urls (List[str]): The URLs to download.
+
+    Returns:
+        List[bytes]: The content of each URL, in the same order as the input.
+    """
+    if not urls:
+        return []
+
+    # An async client is bound to the running event loop, so it is not shared like the sync one
+    async with httpx.AsyncClient(timeout=30) as http_client:
+        responses = await asyncio.gather(*[http_client.get(url) for url in urls])
+
+    return [response.content for response in responses]
 
 
 def is_url(path: str) -> bool:
@@ -62,8 +255,10 @@ def contains_image(inputs: Any) -> bool:
     2. The input is a list, and one or more elements in the list contain an image.
     3. The input is a dictionary, and one or more values in the dictionary contain an image (commonly for chat-based inputs).
     """
-    if isinstance(inputs, list):
-        return any(contains_image(item) for item in inputs)
+    if isinstance(inputs, str):
+        return False
+    elif isinstance(inputs, list):
+        return any(not isinstance(item, str) and contains_image(item) for item in inputs)
     elif isinstance(inputs, dict):
         return any(contains_image(value) for value in inputs.values())
     elif isinstance(inputs, Image):
@@ -94,13 +289,20 @@ def inline_defs(schema):
 
 
 def replace_refs(obj, ref_path, definition):
-    if isinstance(obj, dict):
-        for key, value in list(obj.items()):
-            if key == "$ref" and value == ref_path:
-                obj.clear()
-                obj.update(definition)
+    stack = [obj]
+    visited = set()
+    while stack:
+        node = stack.pop()
+        # Nodes can be shared between several places of the schema once definitions are inlined
+        if id(node) in visited:
+            continue
+        visited.add(id(node))
+
+        if isinstance(node, dict):
+            if node.get("$ref") == ref_path:
+                node.clear()
+                node.update(definition)
             else:
-                replace_refs(value, ref_path, definition)
-    elif isinstance(obj, list):
-        for item in obj:
-            replace_refs(item, ref_path, definition)
+                stack.extend(value for value in node.values() if isinstance(value, (dict, list)))
+        else:
+            stack.extend(item for item in node if isinstance(item, (dict, list)))